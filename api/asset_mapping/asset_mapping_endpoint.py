@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from schema import AssetMappingCreate, AssetMappingResponse, AssetMappingListResponse, AssetMappingID
 from models import EmployeeAssetMapping, Asset
 from settings import get_db
+from mapping_directory import mapping_as_dict, mapping_directory
 from uuid import UUID
 
 router = APIRouter()
@@ -25,6 +26,7 @@ def assign_asset_mapping(mapping: AssetMappingCreate, db: Session = Depends(get_
     db.add(db_mapping)
     db.commit()
     db.refresh(db_mapping)
+    mapping_directory.add(db_mapping.id, db_mapping.emp_id, db_mapping.asset_id, db_mapping.created_at, db_mapping.updated_at)
     return db_mapping
 
 @router.get("/mapping/getallassets/{employeeId}", response_model=AssetMappingListResponse)
@@ -32,6 +34,10 @@ def get_all_assets_mapped(employeeId: UUID, db: Session = Depends(get_db)):
     """
     Get all assets mapped to a specific employee.
 
+    Served from the in-process mapping directory when it is enabled and
+    loaded, otherwise from the database; timestamps are ISO 8601 strings
+    either way.
+
     Args:
         - employeeId (UUID): Employee ID.
         - db (Session): SQLAlchemy database session.
@@ -39,7 +45,34 @@ def get_all_assets_mapped(employeeId: UUID, db: Session = Depends(get_db)):
     Returns:
         AssetMappingListResponse: Pydantic model for the response when retrieving a list of asset mappings.
     """
-    mappings = db.query(EmployeeAssetMapping).filter(EmployeeAssetMapping.emp_id == employeeId).all()
+    mappings = mapping_directory.assets_of(employeeId)
+    if mappings is not None:
+        return {"mappings": mappings}
+    rows = db.query(EmployeeAssetMapping).filter(EmployeeAssetMapping.emp_id == employeeId).all()
+    mappings = [mapping_as_dict(m.id, m.emp_id, m.asset_id, m.created_at, m.updated_at) for m in rows]
+    return {"mappings": mappings}
+
+@router.get("/mapping/getallemployees/{assetId}", response_model=AssetMappingListResponse)
+def get_all_employees_mapped(assetId: UUID, db: Session = Depends(get_db)):
+    """
+    Get all employee mappings for a specific asset.
+
+    Served from the in-process mapping directory when it is enabled and
+    loaded, otherwise from the database; timestamps are ISO 8601 strings
+    either way.
+
+    Args:
+        - assetId (UUID): Asset ID.
+        - db (Session): SQLAlchemy database session.
+
+    Returns:
+        AssetMappingListResponse: Pydantic model for the response when retrieving a list of asset mappings.
+    """
+    mappings = mapping_directory.holders_of(assetId)
+    if mappings is not None:
+        return {"mappings": mappings}
+    rows = db.query(EmployeeAssetMapping).filter(EmployeeAssetMapping.asset_id == assetId).all()
+    mappings = [mapping_as_dict(m.id, m.emp_id, m.asset_id, m.created_at, m.updated_at) for m in rows]
     return {"mappings": mappings}
 
 @router.delete("/mapping/removeassetmapping/{mappingId}", response_model=AssetMappingID)
@@ -59,4 +92,5 @@ def remove_asset_mapping(mappingId: UUID, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Asset mapping not found")
     db.delete(db_mapping)
     db.commit()
+    mapping_directory.remove(mappingId, db_mapping.emp_id)
     return {"mappingId": mappingId}
@@ -0,0 +1,53 @@
+# api/profiling/profiling_api_endpoints.py
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from schema import ProfileListResponse
+from profiling import is_authorized, list_profiles, read_profile
+
+router = APIRouter()
+
+
+def verify_profiling_token(token):
+    """
+    Reject requests that do not carry a valid profiling token.
+
+    Args:
+        - token (Optional[str]): Value of the X-Profile-Token header.
+    """
+    if not is_authorized(token):
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+
+@router.get("/getallprofiles", response_model=ProfileListResponse)
+def get_all_profiles(x_profile_token: str = Header(None)):
+    """
+    List captured request profiles, newest first.
+
+    Args:
+        - x_profile_token (str): Profiling token from the X-Profile-Token header.
+
+    Returns:
+        ProfileListResponse: Pydantic model for the response when listing captured profiles.
+    """
+    verify_profiling_token(x_profile_token)
+    return {"profiles": list_profiles()}
+
+
+@router.get("/getprofile/{profileId}", response_class=PlainTextResponse)
+def get_profile(profileId: str, x_profile_token: str = Header(None)):
+    """
+    Download a captured profile in collapsed-stack format.
+
+    Args:
+        - profileId (str): Profile file name as returned by /getallprofiles.
+        - x_profile_token (str): Profiling token from the X-Profile-Token header.
+
+    Returns:
+        PlainTextResponse: Collapsed stacks, loadable in speedscope or flamegraph.pl.
+    """
+    verify_profiling_token(x_profile_token)
+    profile = read_profile(profileId)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
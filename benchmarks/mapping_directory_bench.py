@@ -0,0 +1,45 @@
+# benchmarks/mapping_directory_bench.py
+#
+# Measure memory and lookup latency of the in-process mapping directory.
+#
+# Usage: python -m benchmarks.mapping_directory_bench [mappings] [assets_per_employee]
+
+import sys
+import time
+import tracemalloc
+import uuid
+
+from mapping_directory import MappingDirectory
+
+
+def main():
+    mappings = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    per_employee = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    employees = [uuid.uuid4() for _ in range(max(1, mappings // per_employee))]
+    assets = [uuid.uuid4() for _ in range(mappings)]
+    mapping_ids = [uuid.uuid4() for _ in range(mappings)]
+
+    directory = MappingDirectory()
+    directory.loaded = True
+
+    tracemalloc.start()
+    for i in range(mappings):
+        directory.add(mapping_ids[i], employees[i % len(employees)], assets[i])
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    lookups = 100_000
+    start = time.perf_counter()
+    for i in range(lookups):
+        directory.assets_of(employees[i % len(employees)])
+    elapsed = time.perf_counter() - start
+
+    print(f"mappings:               {len(directory)}")
+    print(f"memory:                 {used / 2**20:.1f} MiB ({used / mappings:.0f} bytes/mapping)")
+    print(f"memory per million:     {used / mappings:.0f} MB")
+    print(f"assets_of() latency:    {elapsed / lookups * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,19 @@ from api.employee.employee_api_endpoints import router as employee_router
 from api.asset.asset_api_endpoints import router as asset_router
 from api.asset_mapping.asset_mapping_endpoint import router as asset_mapping_router
 from api.dashboard.dashboard_api_endpoints import router as dashboard_router
-from fastapi import FastAPI
+from api.profiling.profiling_api_endpoints import router as profiling_router
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.openapi.models import Info
-from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
+from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html, get_swagger_ui_oauth2_redirect_html
+from profiling import ProfilingMiddleware, is_enabled as profiling_enabled
+from mapping_directory import MAPPING_DIRECTORY_ENABLED, mapping_directory
+from settings import SessionLocal
+from warmup import build_openapi, etag_matches, warm_up, warmup_state
+from sqlalchemy.exc import SQLAlchemyError
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 
@@ -15,7 +25,10 @@ openapi_info = Info(
     description="API documentation for Employee Asset Mapping.",
 )
 
-app = FastAPI(openapi_info=openapi_info)
+# openapi_url=None: /openapi.json is served below from the cached, pre-encoded
+# document; this also disables FastAPI's /docs, /redoc and
+# /docs/oauth2-redirect routes, which are defined below instead
+app = FastAPI(openapi_info=openapi_info, openapi_url=None)
 
 
 # Include routers
@@ -23,7 +36,37 @@ app.include_router(employee_router, prefix="/employee", tags=["Employee"])
 app.include_router(asset_router, prefix="/asset", tags=["Asset"])
 app.include_router(asset_mapping_router, prefix="/mapping", tags=["Mapping"])
 app.include_router(dashboard_router, prefix="/dashboard", tags=["Dashboard"])
+app.include_router(profiling_router, prefix="/profiling", tags=["Profiling"])
+
+# Opt-in per-request profiling (X-Profile-Token header or PROFILING_SAMPLE_RATE)
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
+
 
+@app.on_event("startup")
+def load_mapping_directory():
+    """
+    Load the in-process employee asset mapping directory, if enabled.
+    Lookups fall back to the database if loading fails.
+    """
+    if not MAPPING_DIRECTORY_ENABLED:
+        return
+    db = SessionLocal()
+    try:
+        mapping_directory.load(db)
+    except SQLAlchemyError:
+        logger.exception("Failed to load mapping directory; serving mappings from the database")
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+def warm_up_app():
+    """
+    Configure mappers, compile the OpenAPI schema and pre-connect the
+    database pool before taking traffic.
+    """
+    warm_up(app)
 
 
 # Root path endpoint
@@ -34,9 +77,33 @@ def read_root():
 # Include Swagger UI
 @app.get("/docs", include_in_schema=False)
 async def custom_swagger_ui_html():
-    return get_swagger_ui_html(openapi_url="/openapi.json", title="Employee Asset Mapping API", redoc_url=None)
+    return get_swagger_ui_html(openapi_url="/openapi.json", title="Employee Asset Mapping API", oauth2_redirect_url="/docs/oauth2-redirect")
+
+
+@app.get("/docs/oauth2-redirect", include_in_schema=False)
+async def swagger_ui_redirect():
+    return get_swagger_ui_oauth2_redirect_html()
+
+
+# Include ReDoc
+@app.get("/redoc", include_in_schema=False)
+async def redoc_html():
+    return get_redoc_html(openapi_url="/openapi.json", title="Employee Asset Mapping API")
 
 
 @app.get("/openapi.json", include_in_schema=False)
-async def get_open_api_endpoint():
-    return app.openapi()
\ No newline at end of file
+async def get_open_api_endpoint(request: Request):
+    if warmup_state.openapi_body is None:
+        build_openapi(app)
+    headers = {"ETag": warmup_state.openapi_etag}
+    if etag_matches(request.headers.get("if-none-match"), warmup_state.openapi_etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=warmup_state.openapi_body, media_type="application/json", headers=headers)
+
+
+# Readiness probe: only reports ready once warm-up has completed
+@app.get("/ready", include_in_schema=False)
+def readiness():
+    if not warm_up(app):
+        return JSONResponse(status_code=503, content={"status": "warming up"})
+    return {"status": "ready"}
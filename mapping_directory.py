@@ -0,0 +1,253 @@
+# mapping_directory.py
+
+import os
+import threading
+from array import array
+from datetime import datetime, timezone
+from math import isnan
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from models import EmployeeAssetMapping
+
+# Enable the in-process directory from environment variables
+MAPPING_DIRECTORY_ENABLED = os.environ.get('MAPPING_DIRECTORY_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+
+# Bytes per packed row: mapping UUID, employee UUID, asset UUID
+ROW_SIZE = 48
+
+
+def _to_timestamp(value) -> float:
+    return value.timestamp() if value is not None else float("nan")
+
+
+def _to_datetime(value: float):
+    return None if isnan(value) else datetime.fromtimestamp(value, timezone.utc)
+
+
+def mapping_as_dict(mapping_id: UUID, emp_id: UUID, asset_id: UUID, created_at=None, updated_at=None) -> dict:
+    """
+    Build the AssetMappingResponse dict for a mapping, whether it comes from
+    the directory or from the database.
+
+    Args:
+        mapping_id (UUID): Asset mapping ID.
+        emp_id (UUID): Employee ID.
+        asset_id (UUID): Asset ID.
+        created_at (Optional[datetime]): Creation timestamp.
+        updated_at (Optional[datetime]): Last update timestamp.
+
+    Returns:
+        dict: Mapping with timestamps as ISO 8601 strings in UTC.
+    """
+    return {
+        "id": mapping_id,
+        "emp_id": emp_id,
+        "asset_id": asset_id,
+        "created_at": created_at.astimezone(timezone.utc).isoformat() if created_at is not None else None,
+        "updated_at": updated_at.astimezone(timezone.utc).isoformat() if updated_at is not None else None,
+    }
+
+
+class MappingDirectory:
+    """
+    In-process snapshot of the 'employee_asset_mapping' table with
+    bidirectional indexes (employee -> mappings, asset -> mappings).
+
+    Mappings are stored column-wise in packed form: the three UUIDs of a
+    mapping occupy one 48-byte row of a ``bytearray`` and its timestamps two
+    doubles in ``array('d')`` columns. The indexes map the integer value of
+    an employee or asset UUID to its row number, or to an ``array('I')`` of
+    row numbers once it has more than one mapping. Rows freed by ``remove``
+    are reused by later ``add`` calls.
+
+    The snapshot is loaded once from the database and then kept up to date
+    by the mapping write handlers. Every change bumps ``version``. Lookups
+    return ``None`` while the directory is not loaded so callers can fall
+    back to the database.
+
+    The directory is per process: with several uvicorn workers, a write
+    handled by one worker is not seen by the others, so only enable it for
+    single-worker deployments.
+
+    Memory (CPython 3.11, measured with benchmarks/mapping_directory_bench.py,
+    three assets per employee): about 185 bytes per mapping, i.e. roughly
+    185 MB per million mappings, including timestamps. The packed rows and
+    timestamps take 64 bytes of that; the rest is the two index dicts, whose
+    keys have to be Python ints (~48 bytes per distinct employee or asset)
+    to allow O(1) lookups. assets_of() takes ~25 us per call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+        self.version = 0
+        self.loaded = False
+
+    def _reset(self):
+        self._rows = bytearray()
+        self._created = array('d')
+        self._updated = array('d')
+        self._free = array('I')
+        self._by_emp = {}
+        self._by_asset = {}
+        self._count = 0
+
+    def load(self, db: Session) -> None:
+        """
+        Replace the snapshot with the current contents of the database.
+
+        Args:
+            db (Session): SQLAlchemy database session.
+        """
+        rows = db.query(
+            EmployeeAssetMapping.id,
+            EmployeeAssetMapping.emp_id,
+            EmployeeAssetMapping.asset_id,
+            EmployeeAssetMapping.created_at,
+            EmployeeAssetMapping.updated_at,
+        ).all()
+        with self._lock:
+            self._reset()
+            for mapping_id, emp_id, asset_id, created_at, updated_at in rows:
+                self._insert(mapping_id, emp_id, asset_id, created_at, updated_at)
+            self.version += 1
+            self.loaded = True
+
+    def add(self, mapping_id: UUID, emp_id: UUID, asset_id: UUID, created_at=None, updated_at=None) -> None:
+        """
+        Record a newly created mapping.
+
+        Args:
+            mapping_id (UUID): Asset mapping ID.
+            emp_id (UUID): Employee ID.
+            asset_id (UUID): Asset ID.
+            created_at (Optional[datetime]): Creation timestamp.
+            updated_at (Optional[datetime]): Last update timestamp.
+        """
+        with self._lock:
+            if not self.loaded or self._find(mapping_id, emp_id) is not None:
+                return
+            self._insert(mapping_id, emp_id, asset_id, created_at, updated_at)
+            self.version += 1
+
+    def remove(self, mapping_id: UUID, emp_id: UUID) -> None:
+        """
+        Forget a deleted mapping.
+
+        Args:
+            mapping_id (UUID): Asset mapping ID.
+            emp_id (UUID): Employee ID of the mapping, used to locate its row.
+        """
+        with self._lock:
+            if not self.loaded:
+                return
+            slot = self._find(mapping_id, emp_id)
+            if slot is None:
+                return
+            offset = slot * ROW_SIZE
+            asset_key = int.from_bytes(self._rows[offset + 32:offset + 48], "big")
+            self._discard(self._by_emp, emp_id.int, slot)
+            self._discard(self._by_asset, asset_key, slot)
+            self._rows[offset:offset + ROW_SIZE] = bytes(ROW_SIZE)
+            self._free.append(slot)
+            self._count -= 1
+            self.version += 1
+
+    def assets_of(self, emp_id: UUID):
+        """
+        Get all mappings held by an employee.
+
+        Args:
+            emp_id (UUID): Employee ID.
+
+        Returns:
+            Optional[List[dict]]: Mappings as dicts, or None if the directory is not loaded.
+        """
+        return self._lookup(self._by_emp, emp_id)
+
+    def holders_of(self, asset_id: UUID):
+        """
+        Get all mappings referencing an asset.
+
+        Args:
+            asset_id (UUID): Asset ID.
+
+        Returns:
+            Optional[List[dict]]: Mappings as dicts, or None if the directory is not loaded.
+        """
+        return self._lookup(self._by_asset, asset_id)
+
+    def __len__(self):
+        return self._count
+
+    def _insert(self, mapping_id, emp_id, asset_id, created_at, updated_at) -> None:
+        row = mapping_id.bytes + emp_id.bytes + asset_id.bytes
+        if self._free:
+            slot = self._free.pop()
+            self._rows[slot * ROW_SIZE:(slot + 1) * ROW_SIZE] = row
+            self._created[slot] = _to_timestamp(created_at)
+            self._updated[slot] = _to_timestamp(updated_at)
+        else:
+            slot = len(self._created)
+            self._rows += row
+            self._created.append(_to_timestamp(created_at))
+            self._updated.append(_to_timestamp(updated_at))
+        self._index_add(self._by_emp, emp_id.int, slot)
+        self._index_add(self._by_asset, asset_id.int, slot)
+        self._count += 1
+
+    def _find(self, mapping_id: UUID, emp_id: UUID):
+        target = mapping_id.bytes
+        for slot in self._slots(self._by_emp, emp_id.int):
+            if self._rows[slot * ROW_SIZE:slot * ROW_SIZE + 16] == target:
+                return slot
+        return None
+
+    def _lookup(self, index: dict, key: UUID):
+        with self._lock:
+            if not self.loaded:
+                return None
+            mappings = []
+            for slot in self._slots(index, key.int):
+                row = self._rows[slot * ROW_SIZE:(slot + 1) * ROW_SIZE]
+                mappings.append(mapping_as_dict(
+                    UUID(bytes=bytes(row[0:16])),
+                    UUID(bytes=bytes(row[16:32])),
+                    UUID(bytes=bytes(row[32:48])),
+                    _to_datetime(self._created[slot]),
+                    _to_datetime(self._updated[slot]),
+                ))
+        return mappings
+
+    @staticmethod
+    def _slots(index: dict, key: int):
+        slots = index.get(key, ())
+        return (slots,) if isinstance(slots, int) else slots
+
+    @staticmethod
+    def _index_add(index: dict, key: int, slot: int) -> None:
+        slots = index.get(key)
+        if slots is None:
+            index[key] = slot
+        elif isinstance(slots, int):
+            index[key] = array('I', (slots, slot))
+        else:
+            slots.append(slot)
+
+    @staticmethod
+    def _discard(index: dict, key: int, slot: int) -> None:
+        slots = index.get(key)
+        if slots is None:
+            return
+        if isinstance(slots, int):
+            if slots == slot:
+                del index[key]
+            return
+        slots.remove(slot)
+        if len(slots) == 1:
+            index[key] = slots[0]
+
+
+mapping_directory = MappingDirectory()
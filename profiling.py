@@ -0,0 +1,246 @@
+# profiling.py
+
+import contextvars
+import hmac
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import thread as futures_thread
+
+from starlette.concurrency import run_in_threadpool
+
+# Profiling configuration from environment variables
+PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN')
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', "0"))
+PROFILING_INTERVAL = float(os.environ.get('PROFILING_INTERVAL', "0.005"))
+PROFILING_DIR = os.environ.get('PROFILING_DIR', "/tmp/profiles")
+PROFILING_MAX_FILES = int(os.environ.get('PROFILING_MAX_FILES', "50"))
+
+PROFILING_HEADER = b"x-profile-token"
+
+# Requests to the profiling admin endpoints are never profiled
+PROFILING_ADMIN_PREFIX = "/profiling"
+
+logger = logging.getLogger(__name__)
+
+# Sampler of the request being profiled, visible in the threadpool through
+# the context copied by run_in_threadpool
+_current_sampler = contextvars.ContextVar("current_sampler", default=None)
+
+# Only one request is profiled at a time so the overhead stays bounded
+_profiling_lock = threading.Lock()
+
+
+def is_authorized(token) -> bool:
+    """
+    Check a profiling token against PROFILING_TOKEN.
+
+    Args:
+        token (Optional[str]): Token sent by the client.
+
+    Returns:
+        bool: True if profiling is configured and the token matches.
+    """
+    if not PROFILING_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token, PROFILING_TOKEN)
+
+
+def is_enabled() -> bool:
+    """
+    Check whether profiling is configured at all.
+
+    Returns:
+        bool: True if a profiling token or a sampling rate is set.
+    """
+    return bool(PROFILING_TOKEN) or PROFILING_SAMPLE_RATE > 0
+
+
+class StackSampler:
+    """
+    Statistical profiler that periodically samples the stacks of a single
+    request while it is being served.
+
+    A stack is recorded only if it belongs to the profiled request: on the
+    event loop thread, the ProfilingMiddleware call holding this sampler is
+    on the stack; on threadpool threads (sync endpoints and dependencies),
+    the work item runs in a context whose current sampler is this one. Idle
+    workers and other requests are skipped.
+
+    Attributes:
+        interval (float): Seconds between samples.
+        stacks (Counter): Collapsed stack string -> number of samples.
+    """
+
+    def __init__(self, interval: float = PROFILING_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Signal the sampling thread to stop without waiting for it.
+        """
+        self._stop.set()
+
+    def join(self) -> None:
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                frames = []
+                belongs = False
+                while frame is not None:
+                    code = frame.f_code
+                    belongs = belongs or self._owns(frame)
+                    frames.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if belongs:
+                    frames.append(names.get(thread_id, str(thread_id)))
+                    self.stacks[";".join(reversed(frames))] += 1
+
+    def _owns(self, frame) -> bool:
+        code = frame.f_code
+        if code is ProfilingMiddleware.__call__.__code__:
+            return frame.f_locals.get("sampler") is self
+        if code is futures_thread._WorkItem.run.__code__:
+            context = getattr(getattr(frame.f_locals.get("self"), "fn", None), "__self__", None)
+            return isinstance(context, contextvars.Context) and context.get(_current_sampler) is self
+        return False
+
+    def collapsed(self) -> str:
+        """
+        Render the samples in collapsed-stack format, as read by
+        flamegraph.pl and speedscope.
+
+        Returns:
+            str: One "frame;frame;frame count" line per distinct stack.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def profile_name(method: str, path: str) -> str:
+    """
+    Build a unique file name for a request profile.
+
+    Args:
+        method (str): HTTP method of the profiled request.
+        path (str): URL path of the profiled request.
+
+    Returns:
+        str: Profile file name.
+    """
+    method = re.sub(r"[^A-Za-z]", "", method)[:10] or "UNKNOWN"
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "_", path.strip("/"))[:40].strip("_") or "root"
+    return f"{time.strftime('%Y%m%dT%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-{method}-{slug}.collapsed"
+
+
+def save_profile(sampler: StackSampler, name: str) -> None:
+    """
+    Wait for a stopped sampler, write its profile to PROFILING_DIR and
+    prune old profiles. Blocking; run it in the threadpool.
+
+    Args:
+        sampler (StackSampler): Stopped sampler.
+        name (str): Profile file name from profile_name().
+    """
+    sampler.join()
+    try:
+        os.makedirs(PROFILING_DIR, exist_ok=True)
+        with open(os.path.join(PROFILING_DIR, name), "w") as profile_file:
+            profile_file.write(sampler.collapsed())
+        for stale in list_profiles()[PROFILING_MAX_FILES:]:
+            os.remove(os.path.join(PROFILING_DIR, stale))
+    except OSError:
+        logger.exception("Failed to save request profile %s", name)
+
+
+def list_profiles():
+    """
+    List stored profiles, newest first.
+
+    Returns:
+        List[str]: Profile file names.
+    """
+    if not os.path.isdir(PROFILING_DIR):
+        return []
+    return sorted((name for name in os.listdir(PROFILING_DIR) if name.endswith(".collapsed")), reverse=True)
+
+
+def read_profile(name: str):
+    """
+    Read a stored profile.
+
+    Args:
+        name (str): Profile file name as returned by list_profiles().
+
+    Returns:
+        Optional[str]: Collapsed stacks, or None if there is no such profile.
+    """
+    if name not in list_profiles():
+        return None
+    with open(os.path.join(PROFILING_DIR, name)) as profile_file:
+        return profile_file.read()
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles a request carrying an authorized
+    X-Profile-Token header, or one picked by PROFILING_SAMPLE_RATE. Only
+    requests with an authorized token get the X-Profile-Id response header.
+    Requests to the profiling admin endpoints are not profiled.
+
+    Only install it when is_enabled(); requests that are not profiled then
+    pay for a header scan.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        path = scope["path"]
+        if scope["type"] != "http" or path == PROFILING_ADMIN_PREFIX or path.startswith(PROFILING_ADMIN_PREFIX + "/"):
+            await self.app(scope, receive, send)
+            return
+        token = next((value for key, value in scope["headers"] if key == PROFILING_HEADER), None)
+        authorized = token is not None and is_authorized(token.decode("latin-1"))
+        sampled = PROFILING_SAMPLE_RATE > 0 and random.random() < PROFILING_SAMPLE_RATE
+        if not (authorized or sampled) or not _profiling_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        name = profile_name(scope["method"], path)
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", name.encode("latin-1"))]
+            await send(message)
+
+        sampler = StackSampler()
+        reset_token = _current_sampler.set(sampler)
+        try:
+            sampler.start()
+            await self.app(scope, receive, send_with_profile_id if authorized else send)
+        finally:
+            # Saved even if the request raised: failing requests are the
+            # ones most worth looking at
+            sampler.stop()
+            _current_sampler.reset(reset_token)
+            try:
+                await run_in_threadpool(save_profile, sampler, name)
+            finally:
+                _profiling_lock.release()
@@ -219,4 +219,13 @@ class DashboardResponse(BaseModel):
     Attributes:
         - EmployeeList (List[DashboardEmployee]): List of employee details.
     """
-    EmployeeList: List[DashboardEmployee]
\ No newline at end of file
+    EmployeeList: List[DashboardEmployee]
+
+class ProfileListResponse(BaseModel):
+    """
+    Pydantic model for the response when listing captured request profiles.
+
+    Attributes:
+        - profiles (List[str]): Profile file names, newest first.
+    """
+    profiles: List[str]
@@ -0,0 +1,78 @@
+# tests/test_asset_mapping_endpoints.py
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from mapping_directory import mapping_directory
+from settings import get_db
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def filter(self, *criteria):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def query(self, *entities):
+        return FakeQuery(self.rows)
+
+
+@pytest.fixture
+def mapping():
+    created = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=2)))
+    return SimpleNamespace(id=uuid4(), emp_id=uuid4(), asset_id=uuid4(), created_at=created, updated_at=created)
+
+
+@pytest.fixture
+def client(mapping):
+    app.dependency_overrides[get_db] = lambda: FakeSession([mapping])
+    mapping_directory._reset()
+    mapping_directory.loaded = False
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    mapping_directory._reset()
+    mapping_directory.loaded = False
+
+
+def expected(mapping):
+    return {"mappings": [{
+        "id": str(mapping.id),
+        "emp_id": str(mapping.emp_id),
+        "asset_id": str(mapping.asset_id),
+        "created_at": "2024-01-02T01:04:05+00:00",
+        "updated_at": "2024-01-02T01:04:05+00:00",
+    }]}
+
+
+def test_getallassets_falls_back_to_database(client, mapping):
+    response = client.get(f"/mapping/mapping/getallassets/{mapping.emp_id}")
+    assert response.status_code == 200
+    assert response.json() == expected(mapping)
+
+
+def test_getallemployees_falls_back_to_database(client, mapping):
+    response = client.get(f"/mapping/mapping/getallemployees/{mapping.asset_id}")
+    assert response.status_code == 200
+    assert response.json() == expected(mapping)
+
+
+def test_directory_and_database_return_same_shape(client, mapping):
+    from_database = client.get(f"/mapping/mapping/getallassets/{mapping.emp_id}").json()
+    mapping_directory.loaded = True
+    mapping_directory.add(mapping.id, mapping.emp_id, mapping.asset_id, mapping.created_at, mapping.updated_at)
+    assert client.get(f"/mapping/mapping/getallassets/{mapping.emp_id}").json() == from_database
+    assert client.get(f"/mapping/mapping/getallemployees/{mapping.asset_id}").json() == from_database
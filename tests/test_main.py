@@ -0,0 +1,65 @@
+# tests/test_main.py
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+import warmup
+from main import app
+from warmup import warmup_state
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def not_ready():
+    warmup_state.ready = False
+    yield
+    warmup_state.ready = False
+
+
+def test_openapi_is_served_with_etag(client):
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    assert response.json()["paths"]
+    etag = response.headers["etag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    cached = client.get("/openapi.json", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+
+
+@pytest.mark.parametrize("header", ["*", 'W/{etag}', '"other", {etag}', '"other",W/{etag}'])
+def test_openapi_if_none_match_variants(client, header):
+    etag = client.get("/openapi.json").headers["etag"]
+    response = client.get("/openapi.json", headers={"If-None-Match": header.format(etag=etag)})
+    assert response.status_code == 304
+
+
+def test_openapi_stale_etag_gets_body(client):
+    response = client.get("/openapi.json", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+    assert response.json()["paths"]
+
+
+def test_ready_waits_for_pool_preconnect(client, not_ready, monkeypatch):
+    def failing_preconnect():
+        raise OperationalError("SELECT 1", {}, Exception("unreachable"))
+
+    monkeypatch.setattr(warmup, "preconnect_pool", failing_preconnect)
+    assert client.get("/ready").status_code == 503
+
+    monkeypatch.setattr(warmup, "preconnect_pool", lambda: None)
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+
+
+@pytest.mark.parametrize("path", ["/docs", "/redoc", "/docs/oauth2-redirect"])
+def test_docs_pages_are_served(client, path):
+    assert client.get(path).status_code == 200
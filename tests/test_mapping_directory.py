@@ -0,0 +1,120 @@
+# tests/test_mapping_directory.py
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from mapping_directory import MappingDirectory
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def query(self, *columns):
+        return FakeQuery(self.rows)
+
+
+def loaded_directory(rows=()):
+    directory = MappingDirectory()
+    directory.load(FakeSession(list(rows)))
+    return directory
+
+
+def test_lookups_return_none_before_load():
+    directory = MappingDirectory()
+    directory.add(uuid4(), uuid4(), uuid4())
+    assert directory.assets_of(uuid4()) is None
+    assert directory.holders_of(uuid4()) is None
+    assert len(directory) == 0
+    assert directory.version == 0
+
+
+def test_load_populates_both_indexes():
+    created = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    mapping_id, emp_id, asset_id = uuid4(), uuid4(), uuid4()
+    directory = loaded_directory([(mapping_id, emp_id, asset_id, created, created)])
+    expected = [{
+        "id": mapping_id,
+        "emp_id": emp_id,
+        "asset_id": asset_id,
+        "created_at": created.isoformat(),
+        "updated_at": created.isoformat(),
+    }]
+    assert directory.assets_of(emp_id) == expected
+    assert directory.holders_of(asset_id) == expected
+    assert directory.version == 1
+
+
+def test_add_is_visible_from_both_sides():
+    directory = loaded_directory()
+    emp_id, first_asset, second_asset = uuid4(), uuid4(), uuid4()
+    first, second = uuid4(), uuid4()
+    directory.add(first, emp_id, first_asset)
+    directory.add(second, emp_id, second_asset)
+    assert [m["id"] for m in directory.assets_of(emp_id)] == [first, second]
+    assert [m["emp_id"] for m in directory.holders_of(first_asset)] == [emp_id]
+    assert directory.assets_of(emp_id)[0]["created_at"] is None
+    assert len(directory) == 2
+    assert directory.version == 3
+
+
+def test_add_ignores_duplicate_mapping():
+    directory = loaded_directory()
+    mapping_id, emp_id, asset_id = uuid4(), uuid4(), uuid4()
+    directory.add(mapping_id, emp_id, asset_id)
+    directory.add(mapping_id, emp_id, asset_id)
+    assert len(directory.assets_of(emp_id)) == 1
+    assert directory.version == 2
+
+
+def test_remove_clears_both_indexes():
+    directory = loaded_directory()
+    emp_id, asset_id = uuid4(), uuid4()
+    kept, removed = uuid4(), uuid4()
+    directory.add(kept, emp_id, uuid4())
+    directory.add(removed, emp_id, asset_id)
+    directory.remove(removed, emp_id)
+    assert [m["id"] for m in directory.assets_of(emp_id)] == [kept]
+    assert directory.holders_of(asset_id) == []
+    assert len(directory) == 1
+    assert directory.version == 4
+
+    directory.remove(kept, emp_id)
+    assert directory.assets_of(emp_id) == []
+    assert directory.version == 5
+
+
+def test_remove_unknown_mapping_keeps_version():
+    directory = loaded_directory()
+    directory.remove(uuid4(), uuid4())
+    assert directory.version == 1
+
+
+def test_freed_row_is_reused_without_stale_entries():
+    directory = loaded_directory()
+    old_emp, old_asset, old_id = uuid4(), uuid4(), uuid4()
+    directory.add(old_id, old_emp, old_asset)
+    directory.remove(old_id, old_emp)
+    new_emp, new_asset, new_id = uuid4(), uuid4(), uuid4()
+    directory.add(new_id, new_emp, new_asset)
+    assert directory.assets_of(old_emp) == []
+    assert directory.holders_of(old_asset) == []
+    assert [m["id"] for m in directory.holders_of(new_asset)] == [new_id]
+
+
+def test_load_replaces_previous_snapshot():
+    directory = loaded_directory()
+    stale_emp = uuid4()
+    directory.add(uuid4(), stale_emp, uuid4())
+    directory.load(FakeSession([]))
+    assert directory.assets_of(stale_emp) == []
+    assert len(directory) == 0
+    assert directory.version == 3
@@ -0,0 +1,125 @@
+# tests/test_profiling.py
+
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import profiling
+from api.profiling.profiling_api_endpoints import router as profiling_router
+from profiling import ProfilingMiddleware
+
+TOKEN = "test-token"
+AUTH = {"X-Profile-Token": TOKEN}
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def build_app():
+    app = FastAPI()
+    app.include_router(profiling_router, prefix="/profiling")
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/sync")
+    def profiled_sync_endpoint():
+        busy(0.2)
+        return {}
+
+    @app.get("/async")
+    async def profiled_async_endpoint():
+        busy(0.2)
+        return {}
+
+    @app.get("/concurrent")
+    def concurrent_endpoint():
+        busy(0.4)
+        return {}
+
+    @app.get("/fail")
+    def failing_endpoint():
+        busy(0.1)
+        raise RuntimeError("boom")
+
+    return app
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_TOKEN", TOKEN)
+    monkeypatch.setattr(profiling, "PROFILING_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(profiling, "PROFILING_DIR", str(tmp_path))
+    return TestClient(build_app())
+
+
+def download(client, response):
+    name = response.headers["x-profile-id"]
+    profile = client.get(f"/profiling/getprofile/{name}", headers=AUTH)
+    assert profile.status_code == 200
+    return profile.text
+
+
+def test_sync_endpoint_profile_excludes_concurrent_request(client):
+    background = threading.Thread(target=client.get, args=("/concurrent",))
+    background.start()
+    time.sleep(0.05)
+    response = client.get("/sync", headers=AUTH)
+    background.join()
+    stacks = download(client, response)
+    assert "profiled_sync_endpoint" in stacks
+    assert "concurrent_endpoint" not in stacks
+
+
+def test_async_endpoint_is_profiled(client):
+    stacks = download(client, client.get("/async", headers=AUTH))
+    assert "profiled_async_endpoint" in stacks
+
+
+def test_failing_request_is_saved(client):
+    with pytest.raises(RuntimeError):
+        client.get("/fail", headers=AUTH)
+    assert len(profiling.list_profiles()) == 1
+
+
+def test_requests_without_token_are_not_profiled(client):
+    response = client.get("/async")
+    assert "x-profile-id" not in response.headers
+    assert profiling.list_profiles() == []
+
+
+def test_sampled_requests_get_no_profile_id(client, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_SAMPLE_RATE", 1.0)
+    response = client.get("/async")
+    assert "x-profile-id" not in response.headers
+    assert len(profiling.list_profiles()) == 1
+
+
+def test_admin_endpoints_are_not_profiled(client):
+    client.get("/async", headers=AUTH)
+    name = client.get("/profiling/getallprofiles", headers=AUTH).json()["profiles"][0]
+    client.get(f"/profiling/getprofile/{name}", headers=AUTH)
+    assert profiling.list_profiles() == [name]
+
+
+def test_long_path_gets_short_safe_name(client):
+    response = client.get("/" + "a" * 300 + "%00", headers=AUTH)
+    name = response.headers["x-profile-id"]
+    assert len(name) < 100
+    assert profiling.list_profiles() == [name]
+
+
+def test_admin_endpoints_require_token(client):
+    assert client.get("/profiling/getallprofiles").status_code == 403
+    assert client.get("/profiling/getallprofiles", headers={"X-Profile-Token": "wrong"}).status_code == 403
+    assert client.get("/profiling/getprofile/anything").status_code == 403
+
+
+def test_unknown_profile_is_not_found(client):
+    assert client.get("/profiling/getprofile/missing.collapsed", headers=AUTH).status_code == 404
+    assert client.get("/profiling/getprofile/..%2F..%2Fetc%2Fpasswd", headers=AUTH).status_code == 404
+    assert client.get("/profiling/getprofile/..", headers=AUTH).status_code == 404
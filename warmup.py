@@ -0,0 +1,109 @@
+# warmup.py
+
+import hashlib
+import json
+import logging
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import configure_mappers
+
+from settings import engine
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """
+    Result of the startup warm-up phase.
+
+    Attributes:
+        ready (bool): True once every warm-up step has succeeded.
+        openapi_body (bytes): Pre-encoded OpenAPI document.
+        openapi_etag (str): Quoted ETag of openapi_body.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.openapi_body = None
+        self.openapi_etag = None
+
+
+warmup_state = WarmupState()
+
+
+def build_openapi(app: FastAPI) -> None:
+    """
+    Generate the OpenAPI document once and cache it as encoded bytes.
+
+    Args:
+        app (FastAPI): Application whose schema should be cached.
+    """
+    body = json.dumps(app.openapi(), separators=(",", ":")).encode("utf-8")
+    warmup_state.openapi_body = body
+    warmup_state.openapi_etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag, using weak comparison.
+
+    Args:
+        if_none_match (Optional[str]): Value of the If-None-Match header.
+        etag (str): Current quoted ETag.
+
+    Returns:
+        bool: True if the header is "*" or lists the ETag, with or without W/.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+def preconnect_pool() -> None:
+    """
+    Open the connection pool's connections up front so the first requests
+    do not pay for connection setup.
+    """
+    connections = []
+    try:
+        for _ in range(engine.pool.size()):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def warm_up(app: FastAPI) -> bool:
+    """
+    Run the warm-up phase: configure ORM mappers, compile the OpenAPI
+    schema and pre-connect the database pool. Safe to call again until it
+    succeeds.
+
+    Args:
+        app (FastAPI): Application to warm up.
+
+    Returns:
+        bool: True if the application is ready to take traffic.
+    """
+    if warmup_state.ready:
+        return True
+    configure_mappers()
+    if warmup_state.openapi_body is None:
+        build_openapi(app)
+    try:
+        preconnect_pool()
+    except SQLAlchemyError as exc:
+        logger.warning("Database pre-connect failed; not ready yet: %s", exc)
+        return False
+    warmup_state.ready = True
+    return True